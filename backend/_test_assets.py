@@ -0,0 +1,372 @@
+"""Synthetic document images and the report logger shared by the endpoint test scripts."""
+
+import functools
+import io
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Pre-rendered documents committed with the scripts, by layout name
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+_FIXTURES = {
+    'realistic': 'test_invoice.png',
+    'simple': 'test_invoice_simple.png',
+    'eway_bill': 'test_eway_bill.png',
+}
+
+def get_test_logger():
+    """Return the 'sai.test' logger the scripts report through.
+    
+    Messages go to stdout unadorned; set SAI_QUIET=1 to keep only failures.
+    Only this logger is configured, so importing a script under pytest leaves
+    the root logger alone.
+    """
+    log = logging.getLogger('sai.test')
+    if not log.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log.addHandler(handler)
+        log.setLevel(logging.WARNING if os.environ.get('SAI_QUIET') else logging.INFO)
+        log.propagate = False
+    return log
+
+@functools.lru_cache(maxsize=None)
+def _render_text_tile(text, font):
+    """Rasterize one string once, returning its (left, top) offset and a grayscale tile."""
+    import numpy as np
+    from PIL import Image, ImageDraw
+    
+    left, top, right, bottom = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font)
+    tile = Image.new('L', (max(right - left, 1), max(bottom - top, 1)), 255)
+    ImageDraw.Draw(tile).text((-left, -top), text, fill=0, font=font)
+    return left, top, np.asarray(tile)
+
+class _TileCanvas:
+    """The subset of ImageDraw used by the invoice builders, backed by a NumPy canvas.
+    
+    Each distinct (text, font) pair is rasterized once and pasted as a tile, so
+    rendering many invoices costs one array copy per line after the first.
+    Only black text and horizontal black rules inside the canvas are supported;
+    anything else raises ValueError rather than drawing something different.
+    """
+    
+    def __init__(self, size):
+        import numpy as np
+        
+        width, height = size
+        self.pixels = np.full((height, width), 255, dtype=np.uint8)
+    
+    @staticmethod
+    def _check_fill(fill):
+        if fill != 0:
+            raise ValueError(f"_TileCanvas only draws black (fill=0), got fill={fill!r}")
+    
+    def _check_bounds(self, x, y, width, height):
+        canvas_height, canvas_width = self.pixels.shape
+        if x < 0 or y < 0 or x + width > canvas_width or y + height > canvas_height:
+            raise ValueError(f"Drawing at ({x}, {y}) size {width}x{height} falls outside the "
+                             f"{canvas_width}x{canvas_height} canvas")
+    
+    def textbbox(self, xy, text, font=None):
+        left, top, tile = _render_text_tile(text, font)
+        return (xy[0] + left, xy[1] + top, xy[0] + left + tile.shape[1], xy[1] + top + tile.shape[0])
+    
+    def text(self, xy, text, fill=0, font=None):
+        import numpy as np
+        
+        self._check_fill(fill)
+        left, top, tile = _render_text_tile(text, font)
+        x, y = int(xy[0]) + left, int(xy[1]) + top
+        self._check_bounds(x, y, tile.shape[1], tile.shape[0])
+        region = self.pixels[y:y + tile.shape[0], x:x + tile.shape[1]]
+        # Darkest pixel wins, matching black text drawn onto a white page
+        np.minimum(region, tile, out=region)
+    
+    def multiline_text(self, xy, text, fill=0, font=None, spacing=4):
+        self._check_fill(fill)
+        line_spacing = self.textbbox((0, 0), "A", font=font)[3] + spacing
+        for i, line in enumerate(text.split("\n")):
+            self.text((xy[0], xy[1] + i * line_spacing), line, fill=fill, font=font)
+    
+    def line(self, xy, fill=0, width=1):
+        self._check_fill(fill)
+        (x1, y1), (x2, y2) = xy
+        if y1 != y2:
+            raise ValueError(f"_TileCanvas only draws horizontal lines, got {xy!r}")
+        x1, x2 = sorted((int(x1), int(x2)))
+        self._check_bounds(x1, int(y1), x2 - x1 + 1, width)
+        self.pixels[y1:y1 + width, x1:x2 + 1] = 0
+    
+    def to_image(self):
+        from PIL import Image
+        
+        # Black-on-white needs one channel; the server converts to RGB itself
+        return Image.fromarray(self.pixels, 'L')
+
+@functools.lru_cache(maxsize=None)
+def _default_font():
+    """Load PIL's default font once."""
+    from PIL import ImageFont
+    
+    try:
+        return ImageFont.load_default()
+    except Exception:
+        return None
+
+def _draw_lines(draw, xy, lines, font, pitch):
+    """Draw lines top-down at a fixed pitch with a single multiline_text call."""
+    spacing = pitch - draw.textbbox((0, 0), "A", font=font)[3]
+    draw.multiline_text(xy, "\n".join(lines), fill=0, font=font, spacing=spacing)
+
+def create_realistic_invoice():
+    """Create a more realistic invoice for testing."""
+    draw = _TileCanvas((800, 1000))
+    
+    font_large = font_medium = font_small = _default_font()
+    
+    # Add realistic invoice content, one multiline call per text block
+    
+    # Header
+    draw.text((50, 50), "TECH SOLUTIONS INC.", fill=0, font=font_large)
+    _draw_lines(draw, (50, 90), [
+        "123 Business Avenue",
+        "San Francisco, CA 94102",
+        "Phone: (555) 123-4567",
+        "Email: billing@techsolutions.com",
+    ], font_small, pitch=25)
+    
+    # Invoice details
+    draw.text((50, 225), "INVOICE", fill=0, font=font_large)
+    _draw_lines(draw, (50, 265), [
+        "Invoice Number: INV-2025-0042",
+        "Invoice Date: June 18, 2025",
+        "Due Date: July 18, 2025",
+    ], font_medium, pitch=30)
+    
+    # Bill to
+    draw.text((50, 385), "BILL TO:", fill=0, font=font_medium)
+    _draw_lines(draw, (50, 415), [
+        "Global Manufacturing Corp",
+        "456 Industry Drive",
+        "Detroit, MI 48201",
+    ], font_small, pitch=25)
+    
+    # Line items, one call per column
+    columns = [
+        (50, "DESCRIPTION", ["Software Development Services", "System Integration", "Technical Support (3 months)"]),
+        (300, "QTY", ["120", "40", "1"]),
+        (400, "RATE", ["$150.00", "$175.00", "$2,500.00"]),
+        (500, "AMOUNT", ["$18,000.00", "$7,000.00", "$2,500.00"]),
+    ]
+    for x, header, cells in columns:
+        draw.text((x, 525), header, fill=0, font=font_medium)
+        _draw_lines(draw, (x, 555), cells, font_small, pitch=30)
+    
+    # Totals
+    _draw_lines(draw, (400, 695), ["Subtotal:", "Tax (8.5%):"], font_medium, pitch=30)
+    _draw_lines(draw, (500, 695), ["$27,500.00", "$2,337.50"], font_medium, pitch=30)
+    draw.text((400, 755), "TOTAL:", fill=0, font=font_large)
+    draw.text((500, 755), "$29,837.50", fill=0, font=font_large)
+    
+    # Payment terms
+    _draw_lines(draw, (50, 835), [
+        "Payment Terms: Net 30 days",
+        "Late payments subject to 1.5% monthly service charge",
+    ], font_small, pitch=25)
+    
+    return draw.to_image()
+
+@functools.lru_cache(maxsize=8)
+def _font(size):
+    """Load Arial at the given size once, falling back to the default font."""
+    from PIL import ImageFont
+    
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Arial.ttf", size)
+    except Exception:
+        return ImageFont.load_default()
+
+def create_test_invoice():
+    """Create a simple test invoice image."""
+    # Create a white background
+    draw = _TileCanvas((800, 1000))
+    
+    # Try to use a font, fallback to default if not available
+    font_large = _font(24)
+    font_medium = _font(18)
+    font_small = _font(14)
+    
+    # Header
+    draw.text((50, 50), "TECH SOLUTIONS INC.", fill=0, font=font_large)
+    _draw_lines(draw, (50, 80), ["123 Business Street", "Tech City, TC 12345"], font_small, pitch=20)
+    
+    # Invoice info
+    draw.text((500, 50), "INVOICE", fill=0, font=font_large)
+    _draw_lines(draw, (500, 100), [
+        "Invoice #: INV-2025-0042",
+        "Date: June 18, 2025",
+        "Due Date: July 18, 2025",
+    ], font_medium, pitch=30)
+    
+    # Bill to
+    draw.text((50, 200), "Bill To:", fill=0, font=font_medium)
+    _draw_lines(draw, (50, 230), [
+        "ABC Corporation",
+        "456 Client Avenue",
+        "Client City, CC 67890",
+    ], font_small, pitch=20)
+    
+    # Items table, one call per column
+    y_pos = 350
+    columns = [
+        (50, "Description", ["Software Development Services", "Consulting Services"]),
+        (300, "Qty", ["40", "15"]),
+        (400, "Rate", ["$500.00", "$500.00"]),
+        (500, "Amount", ["$20,000.00", "$7,500.00"]),
+    ]
+    for x, header, cells in columns:
+        draw.text((x, y_pos), header, fill=0, font=font_medium)
+        _draw_lines(draw, (x, y_pos + 40), cells, font_small, pitch=30)
+    
+    # Line
+    draw.line([(50, y_pos + 25), (550, y_pos + 25)], fill=0, width=1)
+    
+    # Totals
+    y_pos = 700
+    _draw_lines(draw, (400, y_pos), ["Subtotal:", "Tax (8.5%):"], font_medium, pitch=30)
+    _draw_lines(draw, (500, y_pos), ["$27,500.00", "$2,337.50"], font_medium, pitch=30)
+    
+    y_pos += 60
+    draw.text((400, y_pos), "Total:", fill=0, font=font_large)
+    draw.text((500, y_pos), "$29,837.50", fill=0, font=font_large)
+    
+    # Payment terms
+    y_pos += 80
+    draw.text((50, y_pos), "Payment Terms: Net 30 Days", fill=0, font=font_small)
+    
+    return draw.to_image()
+
+@functools.lru_cache(maxsize=None)
+def _eway_fonts():
+    """Return the E-way bill's (large, medium, small) fonts, loaded once per process.
+    
+    Loading is the only one-time cost: Pillow rasterizes glyphs on every draw
+    call, so the first render is no slower than later ones and there is no
+    glyph cache to warm up.
+    """
+    return _font(20), _font(16), _font(12)
+
+def create_eway_bill_test():
+    """Create a test E-way bill similar to the uploaded image."""
+    from PIL import Image, ImageDraw
+    
+    # Black-on-white needs one channel; the server converts to RGB itself
+    img = Image.new('L', (800, 1100), 255)
+    draw = ImageDraw.Draw(img)
+    
+    font_large, font_medium, font_small = _eway_fonts()
+    
+    # Header
+    draw.text((300, 30), "E-WAY BILL Details", fill=0, font=font_large)
+    
+    # E-way Bill Info
+    draw.text((50, 80), "E-Way Bill No: 111023233647", fill=0, font=font_medium)
+    _draw_lines(draw, (450, 80), [
+        "Generated Date: 01-05-2025 05:47:00 AM",
+        "Valid Upto: 02-05-2025 11:59:00 PM",
+    ], font_small, pitch=20)
+    
+    # Transport Details
+    draw.text((50, 140), "Mode: Road", fill=0, font=font_small)
+    draw.text((200, 140), "Approx Distance: 74 km", fill=0, font=font_small)
+    draw.text((400, 140), "Transaction Type: Regular", fill=0, font=font_small)
+    
+    # From and To Details, one call per address block
+    parties = [
+        (50, "From:", ["GSTIN: 37AAACV2678L1ZT", "Jerun Beverages Limited", "37, Andhra Pradesh - 517146"]),
+        (450, "To:", ["GSTIN: 33AAPCS6916228", "SCOOTY LOGISTICS PRIVATE LIMITED", "Tamil Nadu"]),
+    ]
+    for x, label, address in parties:
+        draw.text((x, 180), label, fill=0, font=font_medium)
+        _draw_lines(draw, (x, 200), address, font_small, pitch=20)
+    
+    # Goods Details Header
+    draw.text((50, 300), "Goods Details:", fill=0, font=font_medium)
+    
+    # Goods table, one call per column
+    y_pos = 330
+    columns = [
+        (50, "HSN Code", ["22011010", "22021010"]),
+        (150, "Product Description", ["AQUAFINA 250ml PET 36 Bot", "7 UP FIZZ 750ML PET 24*40"]),
+        (400, "Quantity", ["200", "50"]),
+        (500, "Taxable Amount", ["27118.64", "24607.14"]),
+        (650, "Tax Amount", ["4881.36", "6890"]),
+    ]
+    for x, header, cells in columns:
+        draw.text((x, y_pos), header, fill=0, font=font_small)
+        _draw_lines(draw, (x, y_pos + 30), cells, font_small, pitch=25)
+    
+    # Table line
+    draw.line([(50, y_pos + 20), (750, y_pos + 20)], fill=0, width=1)
+    
+    # Totals
+    y_pos += 105
+    draw.text((400, y_pos), "Total Taxable Amount:", fill=0, font=font_medium)
+    draw.text((600, y_pos), "262779.05", fill=0, font=font_medium)
+    _draw_lines(draw, (400, y_pos + 25), ["CGST Amount:", "SGST Amount:"], font_small, pitch=25)
+    _draw_lines(draw, (600, y_pos + 25), ["0", "0"], font_small, pitch=25)
+    
+    # Vehicle Details
+    y_pos += 110
+    draw.text((50, y_pos), "Vehicle Details:", fill=0, font=font_medium)
+    y_pos += 25
+    draw.text((50, y_pos), "Vehicle No: TN394615", fill=0, font=font_small)
+    
+    # Transporter Details
+    y_pos += 40
+    draw.text((50, y_pos), "Transporter Details:", fill=0, font=font_medium)
+    y_pos += 25
+    draw.text((50, y_pos), "Transporter ID & Name: 37AAACG109901ZJ", fill=0, font=font_small)
+    
+    return img
+
+# Document builders by layout name
+_BUILDERS = {
+    'realistic': create_realistic_invoice,
+    'simple': create_test_invoice,
+    'eway_bill': create_eway_bill_test,
+}
+
+def render_invoice_png(layout, compress_level=1):
+    """Render a document layout and encode it as PNG, favouring speed over size by default."""
+    img_bytes = io.BytesIO()
+    _BUILDERS[layout]().save(img_bytes, format='PNG', compress_level=compress_level)
+    # getvalue() hands back the finished buffer without copying, and immutable
+    # bytes let every upload wrap it in its own BytesIO without a copy either;
+    # a getbuffer() memoryview would be copied by each BytesIO instead
+    return img_bytes.getvalue()
+
+@functools.lru_cache(maxsize=None)
+def invoice_png(layout='realistic'):
+    """Return the PNG bytes of a document layout.
+    
+    The committed fixture is read when present, so the scripts normally do no
+    rendering at all; otherwise the layout is rendered once per run.
+    """
+    path = FIXTURES_DIR / _FIXTURES[layout]
+    if path.exists():
+        return path.read_bytes()
+    return render_invoice_png(layout)
+
+def eway_bill_png():
+    """Return the PNG bytes of the test E-way bill."""
+    return invoice_png('eway_bill')
+
+if __name__ == "__main__":
+    # Regenerate the fixtures, E-way bill included, after changing a layout
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    for layout, name in _FIXTURES.items():
+        payload = render_invoice_png(layout, compress_level=9)
+        (FIXTURES_DIR / name).write_bytes(payload)
+        print(f"✅ Wrote fixtures/{name} ({len(payload)} bytes)")
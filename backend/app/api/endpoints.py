@@ -524,6 +524,21 @@ async def compare_services():
         )
 
 
+UNIVERSAL_EXTRACTION_MODES = ["basic", "comprehensive", "detailed"]
+
+
+def _universal_summary(extracted_data: dict, document_analysis: dict, metadata: dict) -> dict:
+    """Summarize one universal extraction result."""
+    return {
+        "total_fields_extracted": len(extracted_data),
+        "document_type": document_analysis.get("structure_type", "unknown"),
+        "confidence": metadata.get("confidence", 0.0),
+        "field_categories": list(set([
+            field_name.split('_')[0] for field_name in extracted_data.keys()
+        ]))
+    }
+
+
 @router.post("/extract-universal", response_model=APIResponse)
 async def extract_universal(
     file: UploadFile = File(..., description="Document image to extract all information from"),
@@ -551,7 +566,7 @@ async def extract_universal(
             raise HTTPException(status_code=400, detail="Only image files are supported")
         
         # Validate extraction mode
-        if extraction_mode not in ["basic", "comprehensive", "detailed"]:
+        if extraction_mode not in UNIVERSAL_EXTRACTION_MODES:
             raise HTTPException(status_code=400, detail="Invalid extraction mode. Use: basic, comprehensive, or detailed")
         
         # Read file data
@@ -583,14 +598,11 @@ async def extract_universal(
         
         # Add extraction summary
         extracted_data = extraction_results["extracted_data"]
-        response_data["summary"] = {
-            "total_fields_extracted": len(extracted_data),
-            "document_type": extraction_results.get("document_analysis", {}).get("structure_type", "unknown"),
-            "confidence": extraction_results["extraction_metadata"].get("confidence", 0.0),
-            "field_categories": list(set([
-                field_name.split('_')[0] for field_name in extracted_data.keys()
-            ]))
-        }
+        response_data["summary"] = _universal_summary(
+            extracted_data,
+            extraction_results.get("document_analysis", {}),
+            extraction_results["extraction_metadata"]
+        )
         
         logger.info(f"Universal extraction completed: {len(extracted_data)} fields extracted")
         
@@ -611,3 +623,106 @@ async def extract_universal(
             data=None,
             errors=[str(e)]
         )
+
+
+@router.post("/extract-universal-multi", response_model=APIResponse)
+async def extract_universal_multi(
+    file: UploadFile = File(..., description="Document image to extract all information from"),
+    extraction_modes: str = Form("basic,comprehensive,detailed", description="Comma-separated extraction modes: basic, comprehensive, detailed"),
+    include_ocr: bool = Form(True, description="Include raw OCR data in response"),
+    include_analysis: bool = Form(True, description="Include document structure analysis")
+):
+    """
+    Universal document extraction in several modes from a single upload.
+    
+    OCR and document structure analysis run once and are shared by every mode;
+    only the mode-specific extraction is repeated. Per-mode results are returned
+    under `results_by_mode`, each shaped like the `/extract-universal` response.
+    """
+    try:
+        # Validate file
+        if not file.content_type or not file.content_type.startswith('image/'):
+            raise HTTPException(status_code=400, detail="Only image files are supported")
+        
+        # Validate extraction modes, keeping the requested order without duplicates
+        modes = list(dict.fromkeys(mode.strip() for mode in extraction_modes.split(',') if mode.strip()))
+        if not modes or any(mode not in UNIVERSAL_EXTRACTION_MODES for mode in modes):
+            raise HTTPException(status_code=400, detail="Invalid extraction modes. Use a comma-separated list of: basic, comprehensive, detailed")
+        
+        # Read file data
+        file_data = await file.read()
+        if len(file_data) > 10 * 1024 * 1024:  # 10MB limit
+            raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB")
+        
+        logger.info(f"Starting universal extraction for {file.filename} in modes: {', '.join(modes)}")
+        
+        # Perform universal extraction, sharing OCR across modes
+        multi_results = await universal_service.extract_everything_multi(file_data, modes)
+        document_analysis = multi_results["document_analysis"]
+        
+        # OCR or structure analysis failed, so no mode could run
+        if "error" in document_analysis:
+            return APIResponse(
+                success=False,
+                message="Universal multi-mode extraction failed",
+                data=None,
+                errors=[document_analysis["error"]]
+            )
+        
+        results_by_mode = {}
+        errors = []
+        for mode, mode_results in multi_results["results_by_mode"].items():
+            if "error" in mode_results:
+                results_by_mode[mode] = {"extraction_mode": mode, "error": mode_results["error"]}
+                errors.append(f"{mode}: {mode_results['error']}")
+                continue
+            
+            extracted_data = mode_results["extracted_data"]
+            metadata = mode_results["extraction_metadata"]
+            results_by_mode[mode] = {
+                "extraction_results": extracted_data,
+                "metadata": metadata,
+                "extraction_mode": mode,
+                "summary": _universal_summary(extracted_data, document_analysis, metadata)
+            }
+        
+        # Prepare response data; analysis and OCR are shared, so they appear once
+        response_data = {
+            "results_by_mode": results_by_mode,
+            "filename": file.filename,
+            "extraction_modes": modes
+        }
+        
+        if include_analysis:
+            response_data["document_analysis"] = document_analysis
+        
+        if include_ocr:
+            response_data["raw_ocr"] = multi_results["raw_ocr"]
+        
+        succeeded = [mode for mode in modes if "error" not in results_by_mode[mode]]
+        logger.info(f"Universal multi-mode extraction completed for {len(succeeded)} of {len(modes)} modes")
+        
+        if not succeeded:
+            message = "Universal extraction failed in every requested mode"
+        elif errors:
+            message = f"Universal extraction completed with {', '.join(succeeded)} modes; some modes failed"
+        else:
+            message = f"Universal extraction completed successfully with {', '.join(modes)} modes"
+        
+        return APIResponse(
+            success=bool(succeeded),
+            message=message,
+            data=response_data,
+            errors=errors or None
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Universal multi-mode extraction failed: {e}")
+        return APIResponse(
+            success=False,
+            message="Universal multi-mode extraction failed",
+            data=None,
+            errors=[str(e)]
+        )
@@ -1,8 +1,30 @@
 """Celery configuration for background task processing."""
 
 from celery import Celery
+from kombu.serialization import register
 from app.config import settings
 
+try:
+    import orjson  # type: ignore
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+# Task results are plain JSON data; encode them with orjson when installed.
+# Task arguments stay on kombu's json, which also handles the raw file bytes.
+if ORJSON_AVAILABLE:
+    register(
+        'orjson',
+        orjson.dumps,  # type: ignore
+        orjson.loads,  # type: ignore
+        content_type='application/x-orjson',
+        content_encoding='utf-8'
+    )
+    RESULT_SERIALIZER = 'orjson'
+else:
+    RESULT_SERIALIZER = 'json'
+
 # Create Celery instance
 celery_app = Celery(
     "document_ai_worker",
@@ -14,8 +36,9 @@ celery_app = Celery(
 # Celery configuration
 celery_app.conf.update(
     task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    accept_content=['json', RESULT_SERIALIZER],
+    result_accept_content=['json', RESULT_SERIALIZER],
+    result_serializer=RESULT_SERIALIZER,
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     
     # Processing Settings
     max_concurrent_processes: int = 5
+    ocr_concurrency: int = os.cpu_count() or 4  # Concurrent documents per batch
+    ocr_cache_size: int = 32  # Recent images whose layout OCR is reused
     retry_attempts: int = 3
     retry_delay: float = 1.0
     
@@ -12,6 +12,7 @@ from app.models.schemas import (
     DocumentType, DocumentProcessingResult, ExtractedField,
     DocumentMetadata, ProcessingStatus, BatchProcessingResult
 )
+from app.config import settings
 from app.services.gemini_service import GeminiService
 from app.utils.logging import get_logger
 from app.utils.helpers import measure_time
@@ -98,7 +99,7 @@ class DocumentProcessingService:
             # Store result
             self.documents[document_id] = result
             
-            logger.info(f"Document {document_id} processed successfully in {processing_time:.2f}s")
+            logger.info("Document %s processed successfully in %.2fs", document_id, processing_time)
             return result
             
         except Exception as e:
@@ -121,7 +122,7 @@ class DocumentProcessingService:
             )
             
             self.documents[document_id] = error_result
-            logger.error(f"Document processing failed for {document_id}: {e}")
+            logger.error("Document processing failed for %s: %s", document_id, e)
             return error_result
     
     async def process_batch(
@@ -133,12 +134,11 @@ class DocumentProcessingService:
         """Process multiple documents in batch."""
         
         batch_id = str(uuid.uuid4())
-        results = []
-        failed_count = 0
         
         try:
-            # Process documents with limited concurrency
-            semaphore = asyncio.Semaphore(3)
+            # Process documents concurrently so independent OCR/Gemini calls overlap,
+            # bounded by the configured OCR concurrency
+            semaphore = asyncio.Semaphore(max(1, settings.ocr_concurrency))
             
             async def process_single(file_data: bytes, filename: str) -> DocumentProcessingResult:
                 async with semaphore:
@@ -146,15 +146,11 @@ class DocumentProcessingService:
                         file_data, filename, document_type, enhance_images
                     )
             
-            # Create tasks
-            tasks = [process_single(file_data, filename) for file_data, filename in files]
-            
-            # Process and collect results
-            for task in asyncio.as_completed(tasks):
-                result = await task
-                results.append(result)
-                if result.status == ProcessingStatus.FAILED:
-                    failed_count += 1
+            # Run all documents and collect results in submission order
+            results = await asyncio.gather(
+                *(process_single(file_data, filename) for file_data, filename in files)
+            )
+            failed_count = sum(1 for result in results if result.status == ProcessingStatus.FAILED)
             
             # Create batch result
             batch_result = BatchProcessingResult(
@@ -162,17 +158,17 @@ class DocumentProcessingService:
                 total_documents=len(files),
                 processed_documents=len(results),
                 failed_documents=failed_count,
-                results=results
+                results=list(results)
             )
             
             # Store batch result
             self.batches[batch_id] = batch_result
             
-            logger.info(f"Batch {batch_id} completed: {len(results) - failed_count}/{len(files)} successful")
+            logger.info("Batch %s completed: %s/%s successful", batch_id, len(results) - failed_count, len(files))
             return batch_result
             
         except Exception as e:
-            logger.error(f"Batch processing failed for {batch_id}: {e}")
+            logger.error("Batch processing failed for %s: %s", batch_id, e)
             # Return empty batch result on error
             return BatchProcessingResult(
                 batch_id=batch_id,
@@ -217,7 +213,7 @@ class DocumentProcessingService:
             return result
             
         except Exception as e:
-            logger.error(f"Field validation failed for {document_id}: {e}")
+            logger.error("Field validation failed for %s: %s", document_id, e)
             return None
     
     async def get_processing_stats(self) -> Dict[str, Any]:
@@ -255,7 +251,7 @@ class DocumentProcessingService:
             return stats
             
         except Exception as e:
-            logger.error(f"Failed to get stats: {e}")
+            logger.error("Failed to get stats: %s", e)
             return {}
     
     async def cleanup_old_results(self, days: int = 7) -> int:
@@ -271,7 +267,7 @@ class DocumentProcessingService:
                 return old_count
             return 0
         except Exception as e:
-            logger.error(f"Cleanup failed: {e}")
+            logger.error("Cleanup failed: %s", e)
             return 0
     
     # Helper methods
@@ -301,7 +297,7 @@ class DocumentProcessingService:
             return output.getvalue()
             
         except Exception as e:
-            logger.warning(f"Image enhancement failed: {e}")
+            logger.warning("Image enhancement failed: %s", e)
             return image_data  # Return original if enhancement fails
     
     def _calculate_overall_confidence(self, extracted_data: Dict[str, ExtractedField]) -> float:
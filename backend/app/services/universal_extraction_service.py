@@ -1,11 +1,15 @@
 """Universal Document Extraction Service - Extract everything from any document."""
 
 import asyncio
+import functools
+import hashlib
 import json
 import re
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Tuple
 from PIL import Image
 import io
+import numpy as np
 
 try:
     import google.generativeai as genai  # type: ignore
@@ -25,6 +29,17 @@ from app.utils.helpers import retry_async, measure_time
 
 logger = get_logger(__name__)
 
+# Label variations to search for alongside each field-name part
+_KEYWORD_EXPANSIONS: Dict[str, Tuple[str, ...]] = {
+    'amt': ('total', 'sum', 'value'),
+    'amount': ('total', 'sum', 'value'),
+    'num': ('id', 'reference', 'ref'),
+    'number': ('id', 'reference', 'ref'),
+    'no': ('id', 'reference', 'ref'),
+    'addr': ('location', 'place'),
+    'address': ('location', 'place'),
+}
+
 
 class UniversalExtractionService:
     """Universal document extraction - extracts all information from any document."""
@@ -34,6 +49,9 @@ class UniversalExtractionService:
         self.model_name = settings.gemini_model
         self.ocr_service = EnhancedOCRService()
         
+        # Layout OCR runs by image SHA-256, most recently used last
+        self._ocr_cache: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        
         # Configure Gemini API
         self.use_real_api = False
         self.model = None
@@ -45,7 +63,7 @@ class UniversalExtractionService:
                 self.use_real_api = True
                 logger.info("Universal Extraction - Gemini API configured successfully")
             except Exception as e:
-                logger.error(f"Failed to configure Gemini API: {e}")
+                logger.error("Failed to configure Gemini API: %s", e)
                 self.model = None
                 self.use_real_api = False
 
@@ -59,35 +77,25 @@ class UniversalExtractionService:
         
         try:
             # Step 1: OCR extraction for spatial understanding
-            ocr_results = await self.ocr_service.extract_text_with_layout(image_data)
+            ocr_results = await self._get_ocr_results(image_data)
             
-            # Step 2: Universal extraction with Gemini
-            extraction_results = await self._universal_gemini_extraction(
-                image_data, ocr_results, extraction_mode
-            )
+            # Step 2: Document structure analysis
+            analysis = await self._analyze_document_structure(ocr_results)
             
-            # Step 3: Structure the results
-            structured_results = await self._structure_universal_results(
-                extraction_results, ocr_results
+            # Step 3: Mode-specific extraction and structuring
+            mode_results = await self._extract_for_mode(
+                image_data, ocr_results, analysis, extraction_mode
             )
             
-            # Step 4: Add metadata and analysis
-            analysis = await self._analyze_document_structure(ocr_results)
-            
             return {
                 "document_analysis": analysis,
-                "extracted_data": structured_results,
+                "extracted_data": mode_results["extracted_data"],
                 "raw_ocr": ocr_results,
-                "extraction_metadata": {
-                    "extraction_mode": extraction_mode,
-                    "total_fields": len(structured_results),
-                    "confidence": self._calculate_overall_confidence(structured_results),
-                    "document_structure": analysis["structure_type"]
-                }
+                "extraction_metadata": mode_results["extraction_metadata"]
             }
             
         except Exception as e:
-            logger.error(f"Universal extraction failed: {e}")
+            logger.error("Universal extraction failed: %s", e)
             return {
                 "document_analysis": {"error": str(e)},
                 "extracted_data": {},
@@ -95,6 +103,105 @@ class UniversalExtractionService:
                 "extraction_metadata": {"error": str(e)}
             }
 
+    @measure_time
+    async def extract_everything_multi(
+        self,
+        image_data: bytes,
+        extraction_modes: List[str]
+    ) -> Dict[str, Any]:
+        """Extract all information in several modes, running OCR and structure analysis once."""
+        
+        try:
+            ocr_results = await self._get_ocr_results(image_data)
+            analysis = await self._analyze_document_structure(ocr_results)
+            
+            # Only the Gemini extraction and structuring differ between modes
+            mode_results = await asyncio.gather(*[
+                self._extract_for_mode(image_data, ocr_results, analysis, mode)
+                for mode in extraction_modes
+            ], return_exceptions=True)
+            
+            # A failing mode must not discard the modes that succeeded
+            results_by_mode = {}
+            for mode, mode_result in zip(extraction_modes, mode_results):
+                if isinstance(mode_result, BaseException):
+                    logger.error("Universal extraction failed for %s mode: %s", mode, mode_result)
+                    mode_result = {"error": str(mode_result)}
+                results_by_mode[mode] = mode_result
+            
+            return {
+                "document_analysis": analysis,
+                "raw_ocr": ocr_results,
+                "results_by_mode": results_by_mode
+            }
+            
+        except Exception as e:
+            logger.error("Universal multi-mode extraction failed: %s", e)
+            return {
+                "document_analysis": {"error": str(e)},
+                "raw_ocr": {},
+                "results_by_mode": {}
+            }
+
+    async def _get_ocr_results(self, image_data: bytes) -> Dict:
+        """Run layout OCR, sharing the result between requests for the same image.
+        
+        Results are keyed by the SHA-256 of the image bytes and kept for the
+        most recent `settings.ocr_cache_size` images; requests that arrive while
+        OCR for the same image is still running await that run. The returned
+        dict is shared, so callers must treat it as read-only.
+        """
+        key = hashlib.sha256(image_data).hexdigest()
+        ocr_run = self._ocr_cache.get(key)
+        if ocr_run is None:
+            ocr_run = asyncio.ensure_future(self.ocr_service.extract_text_with_layout(image_data))
+            self._ocr_cache[key] = ocr_run
+            while len(self._ocr_cache) > max(settings.ocr_cache_size, 0):
+                self._ocr_cache.popitem(last=False)
+        else:
+            self._ocr_cache.move_to_end(key)
+        
+        try:
+            # Shielded so one cancelled request does not cancel OCR shared with others
+            ocr_results = await asyncio.shield(ocr_run)
+        except BaseException:
+            if ocr_run.done() and self._ocr_cache.get(key) is ocr_run:
+                del self._ocr_cache[key]
+            raise
+        
+        # Failed runs are not reused; the next request retries OCR
+        if "error" in ocr_results and self._ocr_cache.get(key) is ocr_run:
+            del self._ocr_cache[key]
+        
+        return ocr_results
+
+    async def _extract_for_mode(
+        self,
+        image_data: bytes,
+        ocr_results: Dict,
+        analysis: Dict[str, Any],
+        extraction_mode: str
+    ) -> Dict[str, Any]:
+        """Run the Gemini extraction for one mode and structure its results."""
+        
+        extraction_results = await self._universal_gemini_extraction(
+            image_data, ocr_results, extraction_mode
+        )
+        
+        structured_results = await self._structure_universal_results(
+            extraction_results, ocr_results
+        )
+        
+        return {
+            "extracted_data": structured_results,
+            "extraction_metadata": {
+                "extraction_mode": extraction_mode,
+                "total_fields": len(structured_results),
+                "confidence": self._calculate_overall_confidence(structured_results),
+                "document_structure": analysis["structure_type"]
+            }
+        }
+
     async def _universal_gemini_extraction(
         self,
         image_data: bytes,
@@ -122,7 +229,7 @@ class UniversalExtractionService:
             return self._parse_universal_response(response.text)
             
         except Exception as e:
-            logger.error(f"Universal Gemini extraction failed: {e}")
+            logger.error("Universal Gemini extraction failed: %s", e)
             return await self._get_universal_mock_extraction(ocr_results, extraction_mode)
 
     def _create_universal_prompt(self, ocr_results: Dict, extraction_mode: str) -> str:
@@ -230,7 +337,7 @@ Be extremely thorough and extract everything visible in the document."""
                 return self._parse_text_response(response_text)
                 
         except Exception as e:
-            logger.warning(f"Failed to parse universal response: {e}")
+            logger.warning("Failed to parse universal response: %s", e)
             return self._parse_text_response(response_text)
 
     def _parse_text_response(self, text: str) -> Dict[str, Any]:
@@ -286,6 +393,12 @@ Be extremely thorough and extract everything visible in the document."""
         structured_fields = {}
         field_counter = 1
         
+        # Normalize block coordinates once for every field lookup in this document
+        block_boxes = self._normalize_block_boxes(
+            ocr_results.get("text_blocks", []),
+            ocr_results.get("image_dimensions", (1, 1))
+        )
+        
         # Process document metadata
         metadata = extraction_results.get("document_metadata", {})
         for key, value in metadata.items():
@@ -295,7 +408,7 @@ Be extremely thorough and extract everything visible in the document."""
                     value=value,
                     confidence=0.95,
                     confidence_level=ConfidenceLevel.HIGH,
-                    location=await self._find_field_location(str(value), ocr_results),
+                    location=await self._find_field_location(str(value), ocr_results, block_boxes),
                     original_text=str(value)
                 )
         
@@ -310,7 +423,7 @@ Be extremely thorough and extract everything visible in the document."""
                         value=value,
                         confidence=0.90,
                         confidence_level=ConfidenceLevel.HIGH,
-                        location=await self._find_field_location(str(value), ocr_results),
+                        location=await self._find_field_location(str(value), ocr_results, block_boxes),
                         original_text=str(value)
                     )
         
@@ -331,7 +444,7 @@ Be extremely thorough and extract everything visible in the document."""
                     value=value,
                     confidence=confidence,
                     confidence_level=self._get_confidence_level(confidence),
-                    location=await self._find_field_location(str(value), ocr_results),
+                    location=await self._find_field_location(str(value), ocr_results, block_boxes),
                     original_text=str(value)
                 )
                 field_counter += 1
@@ -372,82 +485,105 @@ Be extremely thorough and extract everything visible in the document."""
                     value=value,
                     confidence=0.80,
                     confidence_level=ConfidenceLevel.HIGH,
-                    location=await self._find_field_location(str(value), ocr_results),
+                    location=await self._find_field_location(str(value), ocr_results, block_boxes),
                     original_text=str(value)
                 )
         
+        # Validate and refine all matched locations in one pass
+        await self._improve_location_accuracy(structured_fields, ocr_results.get("text_blocks", []), block_boxes)
+        
         return structured_fields
 
-    async def _find_field_location(self, value: str, ocr_results: Dict) -> Optional[FieldLocation]:
-        """Find the spatial location of a field value in the OCR results with enhanced accuracy."""
+    async def _find_field_location(self, value: str, ocr_results: Dict, block_boxes: Optional[np.ndarray] = None) -> Optional[FieldLocation]:
+        """Find the spatial location of a field value in the OCR results.
+        
+        Matches are returned as found; ``_improve_location_accuracy`` validates and
+        refines the locations of all fields of a document together.
+        """
         try:
             text_blocks = ocr_results.get("text_blocks", [])
-            image_dimensions = ocr_results.get("image_dimensions", (1, 1))
             
             if not text_blocks or not value:
                 return None
             
+            if block_boxes is None:
+                block_boxes = self._normalize_block_boxes(text_blocks, ocr_results.get("image_dimensions", (1, 1)))
+            
             value_clean = str(value).strip()
             
             # Strategy 1: Exact match (highest priority)
-            location = await self._find_exact_match(value_clean, text_blocks, image_dimensions)
+            location = await self._find_exact_match(value_clean, text_blocks, block_boxes)
             if location:
-                # Improve accuracy of found location
-                return await self._improve_location_accuracy("", value_clean, location, ocr_results)
+                return location
             
             # Strategy 2: Fuzzy matching with edit distance
-            location = await self._find_fuzzy_match(value_clean, text_blocks, image_dimensions)
+            location = await self._find_fuzzy_match(value_clean, text_blocks, block_boxes)
             if location:
-                return await self._improve_location_accuracy("", value_clean, location, ocr_results)
+                return location
             
             # Strategy 3: Partial matching (for long values)
-            location = await self._find_partial_match(value_clean, text_blocks, image_dimensions)
+            location = await self._find_partial_match(value_clean, text_blocks, block_boxes)
             if location:
-                return await self._improve_location_accuracy("", value_clean, location, ocr_results)
+                return location
             
             # Strategy 4: Pattern-based matching (for structured data)
-            location = await self._find_pattern_match(value_clean, text_blocks, image_dimensions)
+            location = await self._find_pattern_match(value_clean, text_blocks, block_boxes)
             if location:
-                return await self._improve_location_accuracy("", value_clean, location, ocr_results)
+                return location
             
             # Strategy 5: Contextual matching (based on nearby text)
-            location = await self._find_contextual_match(value_clean, text_blocks, image_dimensions)
+            location = await self._find_contextual_match(value_clean, text_blocks, block_boxes)
             if location:
-                return await self._improve_location_accuracy("", value_clean, location, ocr_results)
+                return location
             
             return None
             
         except Exception as e:
-            logger.warning(f"Field location detection failed: {e}")
+            logger.warning("Field location detection failed: %s", e)
             return None
 
-    async def _find_exact_match(self, value: str, text_blocks: List, image_dimensions: Tuple) -> Optional[FieldLocation]:
+    def _normalize_block_boxes(self, text_blocks: List, image_dimensions: Tuple) -> np.ndarray:
+        """Normalize all block bounding boxes to (x, y, width, height) image fractions."""
+        if not text_blocks:
+            return np.empty((0, 4))
+        
+        corners = np.array(
+            [(b.bounding_box.x1, b.bounding_box.y1, b.bounding_box.x2, b.bounding_box.y2) for b in text_blocks],
+            dtype=np.float64
+        )
+        scale = np.asarray(image_dimensions[:2], dtype=np.float64)
+        
+        boxes = np.empty_like(corners)
+        boxes[:, :2] = corners[:, :2] / scale
+        boxes[:, 2:] = (corners[:, 2:] - corners[:, :2]) / scale
+        return boxes
+
+    def _block_location(self, block_boxes: np.ndarray, index: int) -> FieldLocation:
+        """Build a FieldLocation from a row of the normalized block boxes."""
+        x, y, width, height = block_boxes[index].tolist()
+        return FieldLocation(x=x, y=y, width=width, height=height)
+
+    async def _find_exact_match(self, value: str, text_blocks: List, block_boxes: np.ndarray) -> Optional[FieldLocation]:
         """Find exact text matches."""
         value_lower = value.lower()
         
-        for block in text_blocks:
+        for i, block in enumerate(text_blocks):
             block_text_lower = block.text.strip().lower()
             
             if value_lower == block_text_lower:
-                bbox = block.bounding_box
-                return FieldLocation(
-                    x=bbox.x1 / image_dimensions[0],
-                    y=bbox.y1 / image_dimensions[1],
-                    width=(bbox.x2 - bbox.x1) / image_dimensions[0],
-                    height=(bbox.y2 - bbox.y1) / image_dimensions[1]
-                )
+                return self._block_location(block_boxes, i)
         
         return None
 
-    async def _find_fuzzy_match(self, value: str, text_blocks: List, image_dimensions: Tuple) -> Optional[FieldLocation]:
+    async def _find_fuzzy_match(self, value: str, text_blocks: List, block_boxes: np.ndarray) -> Optional[FieldLocation]:
         """Find matches using fuzzy string matching."""
         import difflib
         
         value_lower = value.lower()
-        best_match = None
+        best_index = None
         best_ratio = 0.0
         
-        for block in text_blocks:
+        for i, block in enumerate(text_blocks):
             block_text_lower = block.text.strip().lower()
             
             # Calculate similarity ratio
@@ -455,20 +591,14 @@ Be extremely thorough and extract everything visible in the document."""
             
             if ratio > 0.8 and ratio > best_ratio:  # 80% similarity threshold
                 best_ratio = ratio
-                best_match = block
-        
-        if best_match:
-            bbox = best_match.bounding_box
-            return FieldLocation(
-                x=bbox.x1 / image_dimensions[0],
-                y=bbox.y1 / image_dimensions[1],
-                width=(bbox.x2 - bbox.x1) / image_dimensions[0],
-                height=(bbox.y2 - bbox.y1) / image_dimensions[1]
-            )
+                best_index = i
+        
+        if best_index is not None:
+            return self._block_location(block_boxes, best_index)
         
         return None
 
-    async def _find_partial_match(self, value: str, text_blocks: List, image_dimensions: Tuple) -> Optional[FieldLocation]:
+    async def _find_partial_match(self, value: str, text_blocks: List, block_boxes: np.ndarray) -> Optional[FieldLocation]:
         """Find partial matches for long values."""
         value_lower = value.lower()
         
@@ -477,36 +607,24 @@ Be extremely thorough and extract everything visible in the document."""
             # Split into words and find blocks containing multiple words
             words = [w for w in value_lower.split() if len(w) > 3]  # Ignore short words
             
-            for block in text_blocks:
+            for i, block in enumerate(text_blocks):
                 block_text_lower = block.text.strip().lower()
                 word_matches = sum(1 for word in words if word in block_text_lower)
                 
                 if word_matches >= min(2, len(words) // 2):  # At least half the significant words
-                    bbox = block.bounding_box
-                    return FieldLocation(
-                        x=bbox.x1 / image_dimensions[0],
-                        y=bbox.y1 / image_dimensions[1],
-                        width=(bbox.x2 - bbox.x1) / image_dimensions[0],
-                        height=(bbox.y2 - bbox.y1) / image_dimensions[1]
-                    )
+                    return self._block_location(block_boxes, i)
         
         # For shorter values, try substring matching
-        for block in text_blocks:
+        for i, block in enumerate(text_blocks):
             block_text_lower = block.text.strip().lower()
             
             if (len(value) > 5 and value_lower in block_text_lower) or \
                (len(block_text_lower) > 5 and block_text_lower in value_lower):
-                bbox = block.bounding_box
-                return FieldLocation(
-                    x=bbox.x1 / image_dimensions[0],
-                    y=bbox.y1 / image_dimensions[1],
-                    width=(bbox.x2 - bbox.x1) / image_dimensions[0],
-                    height=(bbox.y2 - bbox.y1) / image_dimensions[1]
-                )
+                return self._block_location(block_boxes, i)
         
         return None
 
-    async def _find_pattern_match(self, value: str, text_blocks: List, image_dimensions: Tuple) -> Optional[FieldLocation]:
+    async def _find_pattern_match(self, value: str, text_blocks: List, block_boxes: np.ndarray) -> Optional[FieldLocation]:
         """Find matches using pattern recognition for structured data."""
         import re
         
@@ -525,48 +643,38 @@ Be extremely thorough and extract everything visible in the document."""
         for pattern_name, pattern in patterns.items():
             if re.search(pattern, value, re.IGNORECASE):
                 # Look for blocks with similar patterns
-                for block in text_blocks:
+                for i, block in enumerate(text_blocks):
                     block_text = block.text.strip()
                     block_clean = re.sub(r'[^\w\d\.\-/]', '', block_text)
                     
                     if re.search(pattern, block_text, re.IGNORECASE) and \
                        (value_clean in block_clean or block_clean in value_clean):
-                        bbox = block.bounding_box
-                        return FieldLocation(
-                            x=bbox.x1 / image_dimensions[0],
-                            y=bbox.y1 / image_dimensions[1],
-                            width=(bbox.x2 - bbox.x1) / image_dimensions[0],
-                            height=(bbox.y2 - bbox.y1) / image_dimensions[1]
-                        )
+                        return self._block_location(block_boxes, i)
         
         return None
 
-    async def _find_contextual_match(self, value: str, text_blocks: List, image_dimensions: Tuple) -> Optional[FieldLocation]:
+    async def _find_contextual_match(self, value: str, text_blocks: List, block_boxes: np.ndarray) -> Optional[FieldLocation]:
         """Find matches based on context and nearby text."""
         # This is more advanced - look for values near labels or in structured positions
         value_lower = value.lower()
         
-        # Sort blocks by position (top to bottom, left to right)
-        sorted_blocks = sorted(text_blocks, key=lambda b: (b.bounding_box.y1, b.bounding_box.x1))
+        # Sort block indices by position (top to bottom, left to right)
+        order = sorted(
+            range(len(text_blocks)),
+            key=lambda i: (text_blocks[i].bounding_box.y1, text_blocks[i].bounding_box.x1)
+        )
         
-        for i, block in enumerate(sorted_blocks):
-            block_text_lower = block.text.strip().lower()
+        for pos, i in enumerate(order):
+            block_text_lower = text_blocks[i].text.strip().lower()
             
             # Check if this might be a label for our value
             if any(keyword in block_text_lower for keyword in ['total', 'amount', 'date', 'number', 'name', 'address']):
                 # Look for values in nearby blocks (next few blocks)
-                for j in range(i + 1, min(i + 5, len(sorted_blocks))):
-                    nearby_block = sorted_blocks[j]
-                    nearby_text = nearby_block.text.strip().lower()
+                for j in order[pos + 1:pos + 5]:
+                    nearby_text = text_blocks[j].text.strip().lower()
                     
                     if value_lower in nearby_text or nearby_text in value_lower:
-                        bbox = nearby_block.bounding_box
-                        return FieldLocation(
-                            x=bbox.x1 / image_dimensions[0],
-                            y=bbox.y1 / image_dimensions[1],
-                            width=(bbox.x2 - bbox.x1) / image_dimensions[0],
-                            height=(bbox.y2 - bbox.y1) / image_dimensions[1]
-                        )
+                        return self._block_location(block_boxes, j)
         
         return None
 
@@ -633,7 +741,7 @@ Be extremely thorough and extract everything visible in the document."""
             return image
             
         except Exception as e:
-            logger.error(f"Image preparation failed: {e}")
+            logger.error("Image preparation failed: %s", e)
             raise
 
     def _get_confidence_level(self, confidence: float) -> ConfidenceLevel:
@@ -719,42 +827,57 @@ Be extremely thorough and extract everything visible in the document."""
         
         return mock_result
 
-    async def _improve_location_accuracy(self, field_name: str, field_value: str, location: FieldLocation, ocr_results: Dict) -> FieldLocation:
-        """Improve location accuracy using field context and validation."""
+    async def _improve_location_accuracy(self, fields: Dict[str, ExtractedField], text_blocks: List, block_boxes: np.ndarray) -> None:
+        """Improve location accuracy of all located fields using context and validation.
+        
+        A field whose improvement fails keeps its original location; the others are still refined.
+        """
+        located = [(name, field) for name, field in fields.items() if field.location is not None]
+        if not located:
+            return
+        
         try:
-            text_blocks = ocr_results.get("text_blocks", [])
-            image_dimensions = ocr_results.get("image_dimensions", (1, 1))
-            
-            # Validate current location makes sense
-            if not self._validate_location(location, field_name, field_value):
-                # Try to find a better location using context
-                improved_location = await self._find_improved_location(field_name, field_value, text_blocks, image_dimensions)
-                if improved_location:
-                    return improved_location
-            
-            # Refine bounding box for better accuracy
-            return self._refine_bounding_box(location, field_value, text_blocks, image_dimensions)
+            locations = np.array(
+                [(f.location.x, f.location.y, f.location.width, f.location.height) for _, f in located],  # type: ignore
+                dtype=np.float64
+            )
+            values = [(f.original_text or "").strip() for _, f in located]
             
+            # Validate current locations make sense and refine bounding boxes for better accuracy
+            valid = self._validate_locations(locations)
+            refined = self._refine_bounding_boxes(locations, np.array([len(v) for v in values], dtype=np.float64))
         except Exception as e:
-            logger.warning(f"Location accuracy improvement failed: {e}")
-            return location
+            logger.warning("Location accuracy improvement failed: %s", e)
+            return
+        
+        for i, (field_name, field) in enumerate(located):
+            try:
+                if not valid[i]:
+                    # Try to find a better location using context
+                    improved_location = await self._find_improved_location(field_name, values[i], text_blocks, block_boxes)
+                    if improved_location:
+                        field.location = improved_location
+                        continue
+                
+                x, y, width, height = refined[i].tolist()
+                field.location = FieldLocation(x=x, y=y, width=width, height=height)
+            except Exception as e:
+                logger.warning("Location accuracy improvement failed for %s: %s", field_name, e)
 
-    def _validate_location(self, location: FieldLocation, field_name: str, field_value: str) -> bool:
-        """Validate if the location makes sense for the field type."""
-        # Check if location is within reasonable bounds
-        if not (0 <= location.x <= 1 and 0 <= location.y <= 1):
-            return False
+    def _validate_locations(self, locations: np.ndarray) -> np.ndarray:
+        """Validate an N x 4 array of (x, y, width, height) locations, returning a boolean mask."""
+        x, y, width, height = locations.T
+        
+        # Check if locations are within reasonable bounds
+        in_bounds = (x >= 0) & (x <= 1) & (y >= 0) & (y <= 1)
         
-        # Check if dimensions are reasonable
-        if location.width and location.height:
-            if location.width > 0.8 or location.height > 0.5:  # Too large
-                return False
-            if location.width < 0.01 or location.height < 0.005:  # Too small
-                return False
+        # Check if dimensions are reasonable, where both are set
+        has_size = (width != 0) & (height != 0)
+        size_ok = (width <= 0.8) & (height <= 0.5) & (width >= 0.01) & (height >= 0.005)
         
-        return True
+        return in_bounds & (~has_size | size_ok)
 
-    async def _find_improved_location(self, field_name: str, field_value: str, text_blocks: List, image_dimensions: Tuple) -> Optional[FieldLocation]:
+    async def _find_improved_location(self, field_name: str, field_value: str, text_blocks: List, block_boxes: np.ndarray) -> Optional[FieldLocation]:
         """Find improved location using multiple strategies."""
         
         # Strategy 1: Look for field labels and find nearby values
@@ -764,21 +887,17 @@ Be extremely thorough and extract everything visible in the document."""
             for i, block in enumerate(text_blocks):
                 if keyword.lower() in block.text.lower():
                     # Look for values in nearby blocks (spatially close)
-                    nearby_blocks = self._find_spatially_close_blocks(block, text_blocks, max_distance=100)
+                    nearby_indices = self._find_spatially_close_blocks(block, text_blocks, max_distance=100)
                     
-                    for nearby_block in nearby_blocks:
-                        if self._is_value_match(field_value, nearby_block.text):
-                            bbox = nearby_block.bounding_box
-                            return FieldLocation(
-                                x=bbox.x1 / image_dimensions[0],
-                                y=bbox.y1 / image_dimensions[1],
-                                width=(bbox.x2 - bbox.x1) / image_dimensions[0],
-                                height=(bbox.y2 - bbox.y1) / image_dimensions[1]
-                            )
+                    for j in nearby_indices:
+                        if self._is_value_match(field_value, text_blocks[j].text):
+                            return self._block_location(block_boxes, j)
         
         return None
 
-    def _extract_field_keywords(self, field_name: str) -> List[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _extract_field_keywords(field_name: str) -> Tuple[str, ...]:
         """Extract keywords from field name for label matching."""
         keywords = []
         
@@ -786,28 +905,21 @@ Be extremely thorough and extract everything visible in the document."""
         parts = field_name.replace('_', ' ').split()
         
         for part in parts:
-            # Add the word itself
+            # Add the word itself and its variations
             keywords.append(part)
-            
-            # Add variations
-            if part.lower() in ['amt', 'amount']:
-                keywords.extend(['total', 'sum', 'value'])
-            elif part.lower() in ['num', 'number', 'no']:
-                keywords.extend(['id', 'reference', 'ref'])
-            elif part.lower() in ['addr', 'address']:
-                keywords.extend(['location', 'place'])
+            keywords.extend(_KEYWORD_EXPANSIONS.get(part.lower(), ()))
         
-        return keywords
+        return tuple(keywords)
 
-    def _find_spatially_close_blocks(self, reference_block: Any, text_blocks: List, max_distance: int = 100) -> List[Any]:
-        """Find text blocks that are spatially close to a reference block."""
+    def _find_spatially_close_blocks(self, reference_block: Any, text_blocks: List, max_distance: int = 100) -> List[int]:
+        """Find indices of text blocks that are spatially close to a reference block."""
         ref_bbox = reference_block.bounding_box
         ref_center_x = (ref_bbox.x1 + ref_bbox.x2) / 2
         ref_center_y = (ref_bbox.y1 + ref_bbox.y2) / 2
         
         close_blocks = []
         
-        for block in text_blocks:
+        for i, block in enumerate(text_blocks):
             if block == reference_block:
                 continue
                 
@@ -819,13 +931,12 @@ Be extremely thorough and extract everything visible in the document."""
             distance = ((center_x - ref_center_x) ** 2 + (center_y - ref_center_y) ** 2) ** 0.5
             
             if distance <= max_distance:
-                close_blocks.append(block)
+                close_blocks.append((distance, i))
         
         # Sort by distance
-        close_blocks.sort(key=lambda b: ((b.bounding_box.x1 + b.bounding_box.x2) / 2 - ref_center_x) ** 2 + 
-                                       ((b.bounding_box.y1 + b.bounding_box.y2) / 2 - ref_center_y) ** 2)
+        close_blocks.sort()
         
-        return close_blocks
+        return [i for _, i in close_blocks]
 
     def _is_value_match(self, expected_value: str, block_text: str) -> bool:
         """Check if block text matches the expected value."""
@@ -840,39 +951,30 @@ Be extremely thorough and extract everything visible in the document."""
         if len(expected_clean) > 10 and expected_clean in block_clean:
             return True
         
+        # The similarity ratio is at most 2 * min(len) / (sum of lens); skip the
+        # fuzzy comparison when that bound already rules out a match
+        expected_len, block_len = len(expected_clean), len(block_clean)
+        if 2 * min(expected_len, block_len) <= 0.85 * (expected_len + block_len):
+            return False
+        
         # Fuzzy match
         import difflib
         ratio = difflib.SequenceMatcher(None, expected_clean, block_clean).ratio()
         return ratio > 0.85
 
-    def _refine_bounding_box(self, location: FieldLocation, field_value: str, text_blocks: List, image_dimensions: Tuple) -> FieldLocation:
-        """Refine bounding box dimensions for better accuracy."""
-        try:
-            # If we have width/height, validate and adjust them
-            if location.width and location.height:
-                # Ensure minimum readable size
-                min_width = max(0.02, len(str(field_value)) * 0.008)  # Adaptive to content length
-                min_height = 0.015  # Minimum height for readability
-                
-                adjusted_width = max(location.width, min_width)
-                adjusted_height = max(location.height, min_height)
-                
-                # Ensure we don't exceed image bounds
-                max_x = 1 - adjusted_width
-                max_y = 1 - adjusted_height
-                
-                adjusted_x = min(location.x, max_x)
-                adjusted_y = min(location.y, max_y)
-                
-                return FieldLocation(
-                    x=adjusted_x,
-                    y=adjusted_y,
-                    width=adjusted_width,
-                    height=adjusted_height
-                )
-            
-            return location
-            
-        except Exception as e:
-            logger.warning(f"Bounding box refinement failed: {e}")
-            return location
+    def _refine_bounding_boxes(self, locations: np.ndarray, value_lengths: np.ndarray) -> np.ndarray:
+        """Refine an N x 4 array of (x, y, width, height) locations for better accuracy."""
+        x, y, width, height = locations.T
+        
+        # Ensure minimum readable size, adaptive to content length
+        adjusted_width = np.maximum(width, np.maximum(0.02, value_lengths * 0.008))
+        adjusted_height = np.maximum(height, 0.015)
+        
+        # Ensure we don't exceed image bounds
+        adjusted_x = np.minimum(x, 1 - adjusted_width)
+        adjusted_y = np.minimum(y, 1 - adjusted_height)
+        
+        # Only locations with width/height are adjusted
+        has_size = (width != 0) & (height != 0)
+        refined = np.column_stack((adjusted_x, adjusted_y, adjusted_width, adjusted_height))
+        return np.where(has_size[:, None], refined, locations)
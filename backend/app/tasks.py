@@ -1,16 +1,62 @@
 """Background tasks for document processing."""
 
 import asyncio
+import threading
 from typing import Optional, List, Tuple
+from celery.signals import worker_process_init, worker_process_shutdown
 from app.celery_app import celery_app
 from app.services.document_service import DocumentProcessingService
 from app.models.schemas import DocumentType
 from app.utils.logging import get_logger
 
+try:
+    import uvloop  # type: ignore
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None  # type: ignore
+
 logger = get_logger(__name__)
 
-# Create service instance
-document_service = DocumentProcessingService()
+# Per-thread worker state, created on first use and reused across tasks so the
+# event loop and the service's client pools survive between task invocations.
+# Prefork and solo pools run every task on one thread per process; the threads
+# pool gets a loop per worker thread, since one loop cannot run in two threads.
+_state = threading.local()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return this thread's persistent event loop, creating it on first use."""
+    loop = getattr(_state, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()  # type: ignore
+        asyncio.set_event_loop(loop)
+        _state.loop = loop
+    return loop
+
+
+def _get_document_service() -> DocumentProcessingService:
+    """Return this thread's document service, creating it on first use."""
+    service = getattr(_state, 'document_service', None)
+    if service is None:
+        service = _state.document_service = DocumentProcessingService()
+    return service
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Set up the event loop and processing service once per prefork worker process."""
+    _get_loop()
+    _get_document_service()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """Close the persistent event loop when a prefork worker process exits."""
+    loop = getattr(_state, 'loop', None)
+    if loop is not None and not loop.is_closed():
+        loop.close()
+    _state.loop = None
 
 
 @celery_app.task(bind=True)
@@ -20,16 +66,11 @@ def process_document_task(self, file_data: bytes, filename: str, document_type:
         # Convert string back to enum if provided
         doc_type = DocumentType(document_type) if document_type else None
         
-        # Run async function in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        result = loop.run_until_complete(
-            document_service.process_document(file_data, filename, doc_type)
+        # Run async function on the worker's persistent loop
+        result = _get_loop().run_until_complete(
+            _get_document_service().process_document(file_data, filename, doc_type)
         )
         
-        loop.close()
-        
         # Return serializable result
         return {
             "document_id": result.document_id,
@@ -47,7 +88,7 @@ def process_document_task(self, file_data: bytes, filename: str, document_type:
         }
         
     except Exception as e:
-        logger.error(f"Document processing task failed: {e}")
+        logger.error("Document processing task failed: %s", e)
         self.retry(countdown=60, max_retries=3)
 
 
@@ -58,16 +99,11 @@ def process_batch_task(self, files_data: List[Tuple[bytes, str]], document_type:
         # Convert string back to enum if provided
         doc_type = DocumentType(document_type) if document_type else None
         
-        # Run async function in sync context
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        result = loop.run_until_complete(
-            document_service.process_batch(files_data, doc_type)
+        # Run async function on the worker's persistent loop
+        result = _get_loop().run_until_complete(
+            _get_document_service().process_batch(files_data, doc_type)
         )
         
-        loop.close()
-        
         # Return serializable result
         return {
             "batch_id": result.batch_id,
@@ -77,5 +113,5 @@ def process_batch_task(self, files_data: List[Tuple[bytes, str]], document_type:
         }
         
     except Exception as e:
-        logger.error(f"Batch processing task failed: {e}")
+        logger.error("Batch processing task failed: %s", e)
         self.retry(countdown=60, max_retries=3)
@@ -1,6 +1,8 @@
 import asyncio
+import logging
 import time
-from typing import Any, Callable, TypeVar, Optional, Awaitable
+from collections import deque
+from typing import Any, Callable, Deque, TypeVar, Optional, Awaitable
 from functools import wraps
 from app.utils.logging import get_logger
 
@@ -33,6 +35,7 @@ async def retry_async(
     """
     last_exception = None
     current_delay = delay
+    func_name = getattr(func, '__name__', repr(func))
     
     for attempt in range(max_attempts):
         try:
@@ -40,10 +43,10 @@ async def retry_async(
         except exceptions as e:
             last_exception = e
             if attempt == max_attempts - 1:
-                logger.error(f"Function {func.__name__} failed after {max_attempts} attempts: {e}")
+                logger.error("Function %s failed after %s attempts: %s", func_name, max_attempts, e)
                 raise e
             
-            logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying in {current_delay}s...")
+            logger.warning("Attempt %s failed for %s: %s. Retrying in %ss...", attempt + 1, func_name, e, current_delay)
             await asyncio.sleep(current_delay)
             current_delay *= backoff
     
@@ -55,28 +58,26 @@ def measure_time(func: Callable) -> Callable:
     """Decorator to measure function execution time."""
     @wraps(func)
     async def async_wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            logger.debug(f"{func.__name__} executed in {execution_time:.2f}s")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s executed in %.2fs", func.__name__, time.perf_counter() - start_time)
             return result
         except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"{func.__name__} failed after {execution_time:.2f}s: {e}")
+            logger.error("%s failed after %.2fs: %s", func.__name__, time.perf_counter() - start_time, e)
             raise
     
     @wraps(func)
     def sync_wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            logger.debug(f"{func.__name__} executed in {execution_time:.2f}s")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s executed in %.2fs", func.__name__, time.perf_counter() - start_time)
             return result
         except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"{func.__name__} failed after {execution_time:.2f}s: {e}")
+            logger.error("%s failed after %.2fs: %s", func.__name__, time.perf_counter() - start_time, e)
             raise
     
     return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
@@ -84,6 +85,11 @@ def measure_time(func: Callable) -> Callable:
 
 def safe_float(value: Any, default: float = 0.0) -> float:
     """Safely convert value to float."""
+    # Fast path for numeric input, skipping the exception machinery
+    if type(value) is float:
+        return value
+    if isinstance(value, int):
+        return float(value)
     try:
         return float(value)
     except (ValueError, TypeError):
@@ -92,20 +98,21 @@ def safe_float(value: Any, default: float = 0.0) -> float:
 
 def safe_int(value: Any, default: int = 0) -> int:
     """Safely convert value to int."""
+    if type(value) is int:
+        return value
     try:
         return int(value)
     except (ValueError, TypeError):
         return default
 
 
+# Confidence level names indexed by the number of thresholds (0.7, 0.9) reached
+_CONFIDENCE_LEVELS = ("low", "medium", "high")
+
+
 def calculate_confidence_level(confidence: float) -> str:
     """Calculate confidence level category."""
-    if confidence >= 0.9:
-        return "high"
-    elif confidence >= 0.7:
-        return "medium"
-    else:
-        return "low"
+    return _CONFIDENCE_LEVELS[(confidence >= 0.7) + (confidence >= 0.9)]
 
 
 def sanitize_filename(filename: str) -> str:
@@ -130,24 +137,32 @@ async def validate_file_type(filename: str, allowed_extensions: list) -> bool:
 
 
 class RateLimiter:
-    """Simple rate limiter for API calls."""
+    """Simple rate limiter for API calls.
+    
+    Call timestamps are kept oldest-first in a deque so expired entries are
+    dropped from the left in O(1). ``acquire`` never awaits, so concurrent
+    coroutines on one event loop cannot interleave inside it.
+    """
     
     def __init__(self, max_calls: int, time_window: int):
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls = []
+        self.calls: Deque[float] = deque()
     
     async def acquire(self) -> bool:
         """Check if a call can be made within rate limits."""
-        now = time.time()
+        now = time.monotonic()
+        cutoff = now - self.time_window
         # Remove old calls outside the time window
-        self.calls = [call_time for call_time in self.calls if now - call_time < self.time_window]
+        calls = self.calls
+        while calls and calls[0] <= cutoff:
+            calls.popleft()
         
-        if len(self.calls) < self.max_calls:
-            self.calls.append(now)
+        if len(calls) < self.max_calls:
+            calls.append(now)
             return True
         return False
     
     def reset(self):
         """Reset the rate limiter."""
-        self.calls = []
+        self.calls.clear()
@@ -1,24 +1,49 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
 from app.config import settings
 
+# Background listener that performs the actual file/console writes
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging():
-    """Setup logging configuration."""
+    """Setup logging configuration.
+
+    Records are put on an in-memory queue by the root logger and written to
+    the file and stdout handlers from a background thread, so logging never
+    blocks the event loop on disk I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
+    formatter = logging.Formatter(log_format)
+
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    
+
+    handlers = [
+        logging.FileHandler(log_dir / settings.log_file, delay=True),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_dir / settings.log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[QueueHandler(log_queue)]
     )
 
 
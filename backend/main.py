@@ -1,7 +1,8 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from contextlib import asynccontextmanager
 import os
 from pathlib import Path
@@ -14,6 +15,152 @@ from app.utils.logging import setup_logging, get_logger
 setup_logging()
 logger = get_logger(__name__)
 
+FRONTEND_FILE = Path(__file__).parent.parent / "frontend" / "index.html"
+
+# Landing page served when the frontend build is not present
+_FALLBACK_TEMPLATE = """<html>
+    <head>
+        <title>Document AI MVP</title>
+        <style>
+            body {{ 
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                max-width: 800px; 
+                margin: 50px auto; 
+                padding: 20px;
+                line-height: 1.6;
+            }}
+            .header {{ text-align: center; margin-bottom: 40px; }}
+            .status {{ 
+                background: #e7f5e7; 
+                border: 1px solid #4caf50; 
+                border-radius: 5px; 
+                padding: 15px; 
+                margin: 20px 0;
+            }}
+            .endpoints {{
+                background: #f5f5f5;
+                border-radius: 5px;
+                padding: 20px;
+                margin: 20px 0;
+            }}
+            .endpoint {{
+                margin: 10px 0;
+                padding: 8px;
+                background: white;
+                border-radius: 3px;
+            }}
+            .method {{
+                display: inline-block;
+                padding: 2px 8px;
+                border-radius: 3px;
+                font-weight: bold;
+                margin-right: 10px;
+            }}
+            .post {{ background: #28a745; color: white; }}
+            .get {{ background: #007bff; color: white; }}
+            .ws {{ background: #6f42c1; color: white; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🤖 Document AI MVP</h1>
+            <p>Intelligent Document Processing with Gemini-2.0-flash</p>
+        </div>
+
+        <div class="status">
+            <h3>✅ API Server Running</h3>
+            <p>The Document AI API is ready to process your documents!</p>
+            <p><strong>Version:</strong> {version}</p>
+            <p><strong>Environment:</strong> {environment}</p>
+        </div>
+
+        <div class="endpoints">
+            <h3>📡 Available Endpoints</h3>
+
+            <div class="endpoint">
+                <span class="method post">POST</span>
+                <strong>/api/process</strong> - Process single document
+            </div>
+
+            <div class="endpoint">
+                <span class="method post">POST</span>
+                <strong>/api/batch</strong> - Process multiple documents
+            </div>
+
+            <div class="endpoint">
+                <span class="method get">GET</span>
+                <strong>/api/documents/{{id}}</strong> - Get processing result
+            </div>
+
+            <div class="endpoint">
+                <span class="method post">POST</span>
+                <strong>/api/validate</strong> - Validate/correct extracted field
+            </div>
+
+            <div class="endpoint">
+                <span class="method get">GET</span>
+                <strong>/api/document-types</strong> - List supported document types
+            </div>
+
+            <div class="endpoint">
+                <span class="method get">GET</span>
+                <strong>/api/stats</strong> - Get processing statistics
+            </div>
+
+            <div class="endpoint">
+                <span class="method get">GET</span>
+                <strong>/api/health</strong> - Health check
+            </div>
+
+            <div class="endpoint">
+                <span class="method ws">WS</span>
+                <strong>/api/ws/progress</strong> - Real-time processing updates
+            </div>
+        </div>
+
+        <div style="text-align: center; margin-top: 40px;">
+            <p>
+                <a href="/api/docs" style="margin: 0 10px;">📚 API Documentation</a>
+                <a href="/api/redoc" style="margin: 0 10px;">📖 API Reference</a>
+            </p>
+            <p style="color: #666; font-size: 0.9em;">
+                Frontend interface will be available here once built.
+            </p>
+        </div>
+    </body>
+</html>
+"""
+
+
+# Static error pages, encoded once rather than rebuilt per error
+_NOT_FOUND_HTML = """<html>
+    <body style="font-family: Arial, sans-serif; text-align: center; margin-top: 100px;">
+        <h1>404 - Page Not Found</h1>
+        <p>The requested resource was not found.</p>
+        <p><a href="/">← Back to Home</a></p>
+    </body>
+</html>
+""".encode()
+
+_INTERNAL_ERROR_HTML = """<html>
+    <body style="font-family: Arial, sans-serif; text-align: center; margin-top: 100px;">
+        <h1>500 - Internal Server Error</h1>
+        <p>Something went wrong on our end.</p>
+        <p><a href="/">← Back to Home</a></p>
+    </body>
+</html>
+""".encode()
+
+
+def _render_frontend_html() -> bytes:
+    """Render the root page once; it does not change while the app is running."""
+    if FRONTEND_FILE.exists():
+        return FRONTEND_FILE.read_bytes()
+    return _FALLBACK_TEMPLATE.format(
+        version=settings.version,
+        environment="Development" if settings.debug else "Production"
+    ).encode()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -29,6 +176,9 @@ async def lifespan(app: FastAPI):
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
     
+    # Cache the root page so GET / does no disk reads or formatting
+    app.state.frontend_html = _render_frontend_html()
+    
     yield
     
     # Shutdown
@@ -54,6 +204,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (extraction results, raw OCR) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Include API routes
 app.include_router(router, prefix="/api")
 
@@ -70,171 +223,29 @@ if frontend_path.exists():
 
 # Serve frontend
 @app.get("/", response_class=HTMLResponse)
-async def serve_frontend():
+async def serve_frontend(request: Request):
     """Serve the main frontend application."""
-    frontend_file = Path(__file__).parent.parent / "frontend" / "index.html"
-    
-    if frontend_file.exists():
-        return HTMLResponse(content=frontend_file.read_text(), status_code=200)
-    else:
-        return HTMLResponse(
-            content="""
-            <html>
-                <head>
-                    <title>Document AI MVP</title>
-                    <style>
-                        body { 
-                            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                            max-width: 800px; 
-                            margin: 50px auto; 
-                            padding: 20px;
-                            line-height: 1.6;
-                        }
-                        .header { text-align: center; margin-bottom: 40px; }
-                        .status { 
-                            background: #e7f5e7; 
-                            border: 1px solid #4caf50; 
-                            border-radius: 5px; 
-                            padding: 15px; 
-                            margin: 20px 0;
-                        }
-                        .endpoints {
-                            background: #f5f5f5;
-                            border-radius: 5px;
-                            padding: 20px;
-                            margin: 20px 0;
-                        }
-                        .endpoint {
-                            margin: 10px 0;
-                            padding: 8px;
-                            background: white;
-                            border-radius: 3px;
-                        }
-                        .method {
-                            display: inline-block;
-                            padding: 2px 8px;
-                            border-radius: 3px;
-                            font-weight: bold;
-                            margin-right: 10px;
-                        }
-                        .post { background: #28a745; color: white; }
-                        .get { background: #007bff; color: white; }
-                        .ws { background: #6f42c1; color: white; }
-                    </style>
-                </head>
-                <body>
-                    <div class="header">
-                        <h1>🤖 Document AI MVP</h1>
-                        <p>Intelligent Document Processing with Gemini-2.0-flash</p>
-                    </div>
-                    
-                    <div class="status">
-                        <h3>✅ API Server Running</h3>
-                        <p>The Document AI API is ready to process your documents!</p>
-                        <p><strong>Version:</strong> {version}</p>
-                        <p><strong>Environment:</strong> {"Development" if settings.debug else "Production"}</p>
-                    </div>
-                    
-                    <div class="endpoints">
-                        <h3>📡 Available Endpoints</h3>
-                        
-                        <div class="endpoint">
-                            <span class="method post">POST</span>
-                            <strong>/api/process</strong> - Process single document
-                        </div>
-                        
-                        <div class="endpoint">
-                            <span class="method post">POST</span>
-                            <strong>/api/batch</strong> - Process multiple documents
-                        </div>
-                        
-                        <div class="endpoint">
-                            <span class="method get">GET</span>
-                            <strong>/api/documents/{'{id}'}</strong> - Get processing result
-                        </div>
-                        
-                        <div class="endpoint">
-                            <span class="method post">POST</span>
-                            <strong>/api/validate</strong> - Validate/correct extracted field
-                        </div>
-                        
-                        <div class="endpoint">
-                            <span class="method get">GET</span>
-                            <strong>/api/document-types</strong> - List supported document types
-                        </div>
-                        
-                        <div class="endpoint">
-                            <span class="method get">GET</span>
-                            <strong>/api/stats</strong> - Get processing statistics
-                        </div>
-                        
-                        <div class="endpoint">
-                            <span class="method get">GET</span>
-                            <strong>/api/health</strong> - Health check
-                        </div>
-                        
-                        <div class="endpoint">
-                            <span class="method ws">WS</span>
-                            <strong>/api/ws/progress</strong> - Real-time processing updates
-                        </div>
-                    </div>
-                    
-                    <div style="text-align: center; margin-top: 40px;">
-                        <p>
-                            <a href="/api/docs" style="margin: 0 10px;">📚 API Documentation</a>
-                            <a href="/api/redoc" style="margin: 0 10px;">📖 API Reference</a>
-                        </p>
-                        <p style="color: #666; font-size: 0.9em;">
-                            Frontend interface will be available here once built.
-                        </p>
-                    </div>
-                </body>
-            </html>
-            """.format(version=settings.version),
-            status_code=200
-        )
+    return Response(content=request.app.state.frontend_html, media_type="text/html")
 
 
 # Custom exception handlers
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
     """Handle 404 errors."""
-    return HTMLResponse(
-        content="""
-        <html>
-            <body style="font-family: Arial, sans-serif; text-align: center; margin-top: 100px;">
-                <h1>404 - Page Not Found</h1>
-                <p>The requested resource was not found.</p>
-                <p><a href="/">← Back to Home</a></p>
-            </body>
-        </html>
-        """,
-        status_code=404
-    )
+    return Response(content=_NOT_FOUND_HTML, status_code=404, media_type="text/html")
 
 
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc):
     """Handle 500 errors."""
-    logger.error(f"Internal server error: {exc}")
-    return HTMLResponse(
-        content="""
-        <html>
-            <body style="font-family: Arial, sans-serif; text-align: center; margin-top: 100px;">
-                <h1>500 - Internal Server Error</h1>
-                <p>Something went wrong on our end.</p>
-                <p><a href="/">← Back to Home</a></p>
-            </body>
-        </html>
-        """,
-        status_code=500
-    )
+    logger.error("Internal server error: %s", exc)
+    return Response(content=_INTERNAL_ERROR_HTML, status_code=500, media_type="text/html")
 
 
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info(f"Starting {settings.app_name} on {settings.host}:{settings.port}")
+    logger.info("Starting %s on %s:%s", settings.app_name, settings.host, settings.port)
     
     uvicorn.run(
         "main:app",
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test real image upload to production endpoints, issuing every request concurrently.
+
+Asynchronous counterpart of test_real_upload.py: the health check, standard
+processing, the three production modes, statistics and service comparison
+are all in flight at once, so the run takes about as long as the slowest
+request. Statistics reflect whatever processing finished before they were
+served.
+"""
+
+import asyncio
+import io
+import sys
+from _test_assets import get_test_logger, invoice_png
+
+try:
+    import aiohttp
+except ImportError:
+    sys.exit("aiohttp is required for this script (pip install aiohttp); "
+             "test_real_upload.py runs the same checks sequentially without it.")
+
+log = get_test_logger()
+
+BASE_URL = "http://localhost:8000/api"
+MODES = ['fast', 'balanced', 'high']
+
+def _form(png_bytes, **fields):
+    """Build a multipart form streaming the invoice from its own BytesIO view."""
+    form = aiohttp.FormData()
+    for name, value in fields.items():
+        form.add_field(name, str(value))
+    form.add_field('file', io.BytesIO(png_bytes), filename='test_invoice.png', content_type='image/png')
+    return form
+
+async def _fetch(session, name, method, url, **kwargs):
+    """Run one request and return (name, status, parsed JSON or error text)."""
+    try:
+        async with session.request(method, url, **kwargs) as response:
+            if response.status == 200:
+                return name, response.status, await response.json()
+            return name, response.status, await response.text()
+    except Exception as e:
+        return name, None, str(e)
+
+def _report(name, status, body):
+    """Report the outcome of one request."""
+    log.info(f"\n🔍 {name}")
+    if status is None:
+        log.error(f"❌ Request failed: {body}")
+        return
+
+    log.info(f"Status: {status}")
+    if status != 200:
+        log.error(f"Response: {body}")
+        return
+    if 'success' in body and not body['success']:
+        log.error(f"❌ Failed: {body.get('message')}")
+        return
+
+    data = body.get('data', body)
+    if 'extracted_data' in data:
+        log.info(f"✅ Processing successful!")
+        log.info(f"   Document ID: {data.get('id')}")
+        log.info(f"   Document Type: {data.get('document_type')}")
+        log.info(f"   Overall Confidence: {data.get('overall_confidence', 0):.1%}")
+        log.info(f"   Processing Time: {data.get('metadata', {}).get('processing_time', 0):.2f}s")
+        log.info(f"   Extracted Fields: {len(data.get('extracted_data', {}))}")
+    elif 'status' in data:
+        log.info(f"✅ Health check passed: {data['status']}")
+    else:
+        log.info(f"✅ Retrieved: {', '.join(data)}")
+
+async def main():
+    log.info("🧪 Testing Production Endpoints Concurrently")
+    log.info("=" * 60)
+
+    img_bytes = invoice_png('simple')
+    log.info(f"📄 Using test invoice ({len(img_bytes)} bytes)")
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=16)) as session:
+        results = await asyncio.gather(
+            _fetch(session, "Health Check", 'GET', f"{BASE_URL}/health"),
+            _fetch(session, "Standard Processing", 'POST', f"{BASE_URL}/process",
+                   data=_form(img_bytes, document_type='invoice', enhance_image=True)),
+            *[
+                _fetch(session, f"Production Processing - {mode.upper()} Mode", 'POST', f"{BASE_URL}/process-production",
+                       data=_form(img_bytes, document_type='invoice', accuracy_mode=mode,
+                                  enable_validation=True, enable_spatial_analysis=True))
+                for mode in MODES
+            ],
+            _fetch(session, "Production Statistics", 'GET', f"{BASE_URL}/production-stats"),
+            _fetch(session, "Service Comparison", 'GET', f"{BASE_URL}/compare-services"),
+        )
+
+    for name, status, body in results:
+        _report(name, status, body)
+
+    log.info(f"\n🎉 Testing completed!")
+
+if __name__ == "__main__":
+    asyncio.run(main())